@@ -2,6 +2,45 @@
 let clipsCache = null;
 let cacheMetadata = null;
 const CACHE_DURATION_MS = 5 * 60 * 1000; // 5 minutes in milliseconds
+const CACHE_STORAGE_KEY = 'clipsCache'; // chrome.storage.session key for the persisted cache
+
+// Store clips and metadata in the cache, mirroring them to session storage
+// so they survive the service worker being shut down between scan and download
+function saveCache(clips, metadata) {
+    clipsCache = clips;
+    cacheMetadata = metadata;
+    chrome.storage.session.set({ [CACHE_STORAGE_KEY]: { clips, metadata } }).catch(error => {
+        console.warn('Failed to persist clip cache:', error);
+    });
+}
+
+// Clear the cache from memory and session storage
+function clearCache() {
+    clipsCache = null;
+    cacheMetadata = null;
+    chrome.storage.session.remove(CACHE_STORAGE_KEY).catch(() => {
+        // Ignore errors, the in-memory cache is already cleared
+    });
+}
+
+// Restore the cache from session storage if the service worker was restarted
+async function loadCache() {
+    if (clipsCache && cacheMetadata) {
+        return;
+    }
+    
+    try {
+        const result = await chrome.storage.session.get([CACHE_STORAGE_KEY]);
+        const stored = result[CACHE_STORAGE_KEY];
+        if (stored) {
+            clipsCache = stored.clips;
+            cacheMetadata = stored.metadata;
+            console.log('Restored clip cache from session storage');
+        }
+    } catch (error) {
+        console.warn('Failed to restore clip cache:', error);
+    }
+}
 
 // Retry utility for network requests with exponential backoff
 async function retryWithBackoff(fn, maxRetries = 3, initialDelayMs = 1000) {
@@ -35,8 +74,7 @@ function isCacheValid(channelId, startDate, endDate, accountList = [], listMode
     if (now - cacheMetadata.timestamp > CACHE_DURATION_MS) {
         console.log('Cache expired (older than 5 minutes) - clearing cache');
         // Clear expired cache
-        clipsCache = null;
-        cacheMetadata = null;
+        clearCache();
         return false;
     }
     
@@ -106,6 +144,7 @@ async function handleButton1Action(data, tabId) {
         let originalCount;
         
         // Check if we can use cached data
+        await loadCache();
         if (isCacheValid(data.channelId, data.startDate, data.endDate, data.accountList || [], data.listMode || 'none', data.maxGap || 0, data.coverageThreshold || 0.95)) {
             console.log('Using cached clip data (already filtered by account list)');
             const cacheAge = Math.floor((Date.now() - cacheMetadata.timestamp) / 1000);
@@ -130,8 +169,7 @@ async function handleButton1Action(data, tabId) {
             console.log(`Filtering complete: ${originalCount} → ${clips.length} clips (${originalCount - clips.length} filtered by account list)`);
             
             // Update cache with filtered clips and metadata
-            clipsCache = clips;
-            cacheMetadata = {
+            saveCache(clips, {
                 channelId: data.channelId,
                 startDate: data.startDate,
                 endDate: data.endDate,
@@ -141,14 +179,13 @@ async function handleButton1Action(data, tabId) {
                 coverageThreshold: data.coverageThreshold || 0.95,
                 originalCount: originalCount,
                 timestamp: Date.now()
-            };
+            });
         }
         
         console.log(`Starting redundancy filtering on ${clips.length} clips...`);
         
         // Separate clips with and without offset data
-        const clipsWithNullOffset = clips.filter(clip => clip.vod_offset === null || clip.vod_offset === undefined);
-        const clipsWithValidOffset = clips.filter(clip => clip.vod_offset !== null && clip.vod_offset !== undefined);
+        const { clipsWithValidOffset, clipsWithNullOffset } = partitionClipsByOffset(clips);
         
         let filteredClips;
         
@@ -185,7 +222,6 @@ async function handleButton1Action(data, tabId) {
         
         return { 
             success: true, 
-            clips: filteredClips, 
             count: filteredClips.length, 
             originalCount: originalCount,
             downloaded: downloadResult.successful,
@@ -222,8 +258,7 @@ async function handleButton2Action(data) {
         console.log(`Account filtering complete: ${clips.length} → ${accountFilteredClips.length} clips (${clips.length - accountFilteredClips.length} filtered by account list)`);
         
         // Separate clips with and without offset data
-        const clipsWithNullOffset = accountFilteredClips.filter(clip => clip.vod_offset === null || clip.vod_offset === undefined);
-        const clipsWithValidOffset = accountFilteredClips.filter(clip => clip.vod_offset !== null && clip.vod_offset !== undefined);
+        const { clipsWithValidOffset, clipsWithNullOffset } = partitionClipsByOffset(accountFilteredClips);
         
         let filteredClips;
         let partialFilteringApplied = false;
@@ -254,8 +289,7 @@ async function handleButton2Action(data) {
         console.log(`All filtering complete: ${clips.length} → ${filteredClips.length} clips total`);
         
         // Cache the FILTERED results with timestamp
-        clipsCache = filteredClips;
-        cacheMetadata = {
+        saveCache(filteredClips, {
             channelId: data.channelId,
             startDate: data.startDate,
             endDate: data.endDate,
@@ -265,7 +299,7 @@ async function handleButton2Action(data) {
             coverageThreshold: data.coverageThreshold || 0.95,
             originalCount: clips.length,
             timestamp: Date.now()
-        };
+        });
         
         // Calculate total duration of filtered clips
         const totalDuration = filteredClips.reduce((sum, clip) => sum + (clip.duration || 0), 0);
@@ -419,10 +453,13 @@ async function fetchClipsByDateRange(broadcasterId, userId, oauthToken, startDat
     // Convert Map to Array
     const allClips = Array.from(allClipsMap.values());
     
+    // Parse each creation date once instead of twice per comparison
+    const createdAtMs = new Map(allClips.map(clip => [clip.id, Date.parse(clip.created_at)]));
+    
     // Sort clips by date (oldest first), then by vod_offset (earliest in stream first)
     allClips.sort((a, b) => {
-        const dateA = new Date(a.created_at);
-        const dateB = new Date(b.created_at);
+        const dateA = createdAtMs.get(a.id);
+        const dateB = createdAtMs.get(b.id);
         
         // First sort by date
         if (dateA < dateB) return -1;
@@ -457,14 +494,17 @@ function applyAccountListFilter(clips, accountList = [], listMode = 'none') {
     
     let filteredClips = clips;
     
+    // Hash the account names once so each clip is a Set lookup instead of a scan of the list
+    const accounts = new Set(accountList);
+    
     // If list is empty, treat as blacklist with no accounts blocked (no filtering)
     if (listMode === 'whitelist' && accountList.length > 0) {
         const beforeCount = filteredClips.length;
-        filteredClips = filteredClips.filter(clip => accountList.includes(clip.creator_name));
+        filteredClips = filteredClips.filter(clip => accounts.has(clip.creator_name));
         console.log(`Whitelist applied: ${beforeCount} → ${filteredClips.length} clips (only clips from: ${accountList.join(', ')})`);
     } else if (listMode === 'blacklist' && accountList.length > 0) {
         const beforeCount = filteredClips.length;
-        filteredClips = filteredClips.filter(clip => !accountList.includes(clip.creator_name));
+        filteredClips = filteredClips.filter(clip => !accounts.has(clip.creator_name));
         console.log(`Blacklist applied: ${beforeCount} → ${filteredClips.length} clips (excluded clips from: ${accountList.join(', ')})`);
     } else {
         console.log(`No account filtering applied (list is empty or mode is 'none')`);
@@ -475,24 +515,34 @@ function applyAccountListFilter(clips, accountList = [], listMode = 'none') {
     return filteredClips;
 }
 
-// Helper function to check if two clips overlap in time
-function clipsOverlap(clip1, clip2) {
-    const start1 = Math.floor(clip1.vod_offset || 0);
-    const start2 = Math.floor(clip2.vod_offset || 0);
-    
-    // Fast pre-filter: if clips start more than 60s apart, they can't overlap
-    // (Twitch clips max out at 60 seconds)
-    const MAX_CLIP_DURATION = 60;
-    if (Math.abs(start1 - start2) > MAX_CLIP_DURATION) {
-        return false;
+// Split clips into those with and without timeline data (vod_offset) in a single pass
+function partitionClipsByOffset(clips) {
+    const clipsWithValidOffset = [];
+    const clipsWithNullOffset = [];
+    
+    for (const clip of clips) {
+        if (clip.vod_offset === null || clip.vod_offset === undefined) {
+            clipsWithNullOffset.push(clip);
+        } else {
+            clipsWithValidOffset.push(clip);
+        }
     }
     
-    const end1 = Math.floor(start1 + clip1.duration);
-    const end2 = Math.floor(start2 + clip2.duration);
-    
+    return { clipsWithValidOffset, clipsWithNullOffset };
+}
+
+// Helper function to get a clip's position in the stream as whole seconds [start, end)
+function getClipSpan(clip) {
+    const start = Math.floor(clip.vod_offset || 0);
+    const end = Math.floor(start + clip.duration);
+    return { start, end };
+}
+
+// Helper function to check if two clip spans overlap in time
+function clipsOverlap(span1, span2) {
     // Two clips overlap if: !(end1 <= start2 || end2 <= start1)
     // Simplified: start1 < end2 && start2 < end1
-    return start1 < end2 && start2 < end1;
+    return span1.start < span2.end && span2.start < span1.end;
 }
 
 // Filter out redundant clips that are fully contained within other clips
@@ -509,32 +559,41 @@ function filterRedundantClips(clips, maxGap = 0, coverageThreshold = 0.95) {
     // Sort clips by duration (longest first) - we want to keep longer clips and remove shorter redundant ones
     const sortedClips = [...clips].sort((a, b) => b.duration - a.duration);
     
-    // PHASE 1: Build overlap map (O(N²) comparisons)
-    const overlapMap = new Map(); // clipId -> [ids of clips that overlap with it]
+    // Compute each clip's span once up front instead of on every comparison
+    const spans = new Map(sortedClips.map(clip => [clip.id, getClipSpan(clip)]));
+    
+    // PHASE 1: Build overlap map in a single sweep over clips ordered by start time
+    // (O(N log N + N × M) instead of comparing every pair)
+    const overlapMap = new Map(sortedClips.map(clip => [clip.id, new Set()])); // clipId -> Set of ids of clips that overlap with it
+    const clipsByStart = [...sortedClips].sort((a, b) => spans.get(a.id).start - spans.get(b.id).start);
     let overlapCheckComparisons = 0;
     
-    for (let i = 0; i < sortedClips.length; i++) {
-        const clip = sortedClips[i];
-        const overlappingIds = [];
+    for (let i = 0; i < clipsByStart.length; i++) {
+        const clip = clipsByStart[i];
+        const span = spans.get(clip.id);
         
-        for (let j = 0; j < sortedClips.length; j++) {
-            if (i === j) continue;
+        for (let j = i + 1; j < clipsByStart.length; j++) {
+            const otherClip = clipsByStart[j];
+            const otherSpan = spans.get(otherClip.id);
+            
+            // Every remaining clip starts at or after this one ends, so none of them can overlap it
+            if (otherSpan.start >= span.end) break;
             
             overlapCheckComparisons++;
-            if (clipsOverlap(clip, sortedClips[j])) {
-                overlappingIds.push(sortedClips[j].id);
+            if (clipsOverlap(span, otherSpan)) {
+                // Overlap is symmetric, record it for both clips
+                overlapMap.get(clip.id).add(otherClip.id);
+                overlapMap.get(otherClip.id).add(clip.id);
             }
         }
-        
-        overlapMap.set(clip.id, overlappingIds);
     }
     
     // PHASE 2: Filter using only overlapping clips (O(N × M × D) where M = overlaps per clip)
     let coverageCheckComparisons = 0;
+    const keptClipIds = new Set(); // ids in clipsToKeep, updated as clips are kept
     
     for (const clip of sortedClips) {
-        const clipStart = Math.floor(clip.vod_offset || 0);
-        const clipEnd = Math.floor(clipStart + clip.duration);
+        const { start: clipStart, end: clipEnd } = spans.get(clip.id);
         const clipDuration = clipEnd - clipStart;
         
         if (clipDuration <= 0) {
@@ -543,31 +602,36 @@ function filterRedundantClips(clips, maxGap = 0, coverageThreshold = 0.95) {
         }
         
         // Get only the clips we've already kept that OVERLAP with this clip
-        const overlappingIds = overlapMap.get(clip.id) || [];
-        const keptClipIds = new Set(clipsToKeep.map(c => c.id));
-        const relevantKeptClips = clipsToKeep.filter(c => overlappingIds.includes(c.id));
+        // (walks this clip's overlap set rather than rescanning every kept clip)
+        const overlappingIds = overlapMap.get(clip.id) || new Set();
+        const relevantKeptIds = [];
+        for (const id of overlappingIds) {
+            if (keptClipIds.has(id)) {
+                relevantKeptIds.push(id);
+            }
+        }
         
-        coverageCheckComparisons += relevantKeptClips.length;
+        coverageCheckComparisons += relevantKeptIds.length;
         
-        // Create a set of all seconds covered by overlapping kept clips
-        const coveredSeconds = new Set();
+        // Mark which seconds of this clip are covered by overlapping kept clips
+        // (one byte per second of the clip, index 0 = clipStart)
+        const coveredSeconds = new Uint8Array(clipDuration);
         
-        for (const otherClip of relevantKeptClips) {
-            const otherStart = Math.floor(otherClip.vod_offset || 0);
-            const otherEnd = Math.floor(otherStart + otherClip.duration);
+        for (const otherId of relevantKeptIds) {
+            const { start: otherStart, end: otherEnd } = spans.get(otherId);
             
-            // Add each second from this other clip to the covered set
-            for (let second = otherStart; second < otherEnd; second++) {
-                coveredSeconds.add(second);
+            // Only the part of the other clip inside this clip's range matters
+            const from = Math.max(otherStart, clipStart) - clipStart;
+            const to = Math.min(otherEnd, clipEnd) - clipStart;
+            if (from < to) {
+                coveredSeconds.fill(1, from, to);
             }
         }
         
         // Count how many seconds of the current clip are covered by other clips
         let coveredCount = 0;
-        for (let second = clipStart; second < clipEnd; second++) {
-            if (coveredSeconds.has(second)) {
-                coveredCount++;
-            }
+        for (let i = 0; i < clipDuration; i++) {
+            coveredCount += coveredSeconds[i];
         }
         
         // Calculate coverage percentage
@@ -580,8 +644,8 @@ function filterRedundantClips(clips, maxGap = 0, coverageThreshold = 0.95) {
             let maxGapSize = 0;
             let currentGapSize = 0;
             
-            for (let second = clipStart; second < clipEnd; second++) {
-                if (!coveredSeconds.has(second)) {
+            for (let i = 0; i < clipDuration; i++) {
+                if (!coveredSeconds[i]) {
                     currentGapSize++;
                     maxGapSize = Math.max(maxGapSize, currentGapSize);
                 } else {
@@ -599,10 +663,12 @@ function filterRedundantClips(clips, maxGap = 0, coverageThreshold = 0.95) {
             } else {
                 // Keep it because removing it would create too large a gap
                 clipsToKeep.push(clip);
+                keptClipIds.add(clip.id);
             }
         } else {
             // Not redundant enough, keep it
             clipsToKeep.push(clip);
+            keptClipIds.add(clip.id);
         }
     }
     
@@ -625,7 +691,7 @@ async function downloadClips(clips, broadcasterId, editorId, clientId, oauthToke
     
     let successful = 0;
     let failed = 0;
-    const failedClips = [];
+    const failedClipIds = new Set(); // Set so repeated failures for a clip are only recorded once
     
     // Get download URLs for all clips first
     const CHUNK_SIZE = 10;
@@ -653,7 +719,7 @@ async function downloadClips(clips, broadcasterId, editorId, clientId, oauthToke
             // Mark these clips as failed
             chunk.forEach(clip => {
                 failed++;
-                failedClips.push(clip.id);
+                failedClipIds.add(clip.id);
             });
         }
     }
@@ -665,11 +731,30 @@ async function downloadClips(clips, broadcasterId, editorId, clientId, oauthToke
     
     console.log(`\nStarting parallel downloads for ${allDownloadUrls.length} clips...`);
     
+    // Report download progress as clips finish, throttled so a burst of
+    // completions doesn't flood the popup with messages
+    const PROGRESS_INTERVAL_MS = 250;
+    let completedDownloads = 0;
+    let lastProgressTime = 0;
+    
+    function reportDownloadProgress() {
+        completedDownloads++;
+        const now = Date.now();
+        if (progressCallback && (completedDownloads === allDownloadUrls.length || now - lastProgressTime >= PROGRESS_INTERVAL_MS)) {
+            lastProgressTime = now;
+            progressCallback(`Downloading (${completedDownloads}/${allDownloadUrls.length})`);
+        }
+    }
+    
+    // Index clips by id once so matching each URL back to its clip is a single lookup
+    const clipsById = new Map(clips.map(clip => [clip.id, clip]));
+    
     // Download all clips in parallel
     const downloadPromises = allDownloadUrls.map(async (urlData) => {
-        const clipInfo = clips.find(c => c.id === urlData.clip_id);
+        const clipInfo = clipsById.get(urlData.clip_id);
         if (!clipInfo) {
             console.error(`  ✗ Clip info not found for: ${urlData.clip_id}`);
+            reportDownloadProgress();
             return { success: false, clipId: urlData.clip_id };
         }
         
@@ -680,6 +765,8 @@ async function downloadClips(clips, broadcasterId, editorId, clientId, oauthToke
         } catch (error) {
             console.error(`  ✗ Failed to download: ${clipInfo.title} (${urlData.clip_id})`, error.message);
             return { success: false, clipId: urlData.clip_id };
+        } finally {
+            reportDownloadProgress();
         }
     });
     
@@ -692,9 +779,7 @@ async function downloadClips(clips, broadcasterId, editorId, clientId, oauthToke
             successful++;
         } else {
             failed++;
-            if (!failedClips.includes(result.clipId)) {
-                failedClips.push(result.clipId);
-            }
+            failedClipIds.add(result.clipId);
         }
     });
     
@@ -702,6 +787,7 @@ async function downloadClips(clips, broadcasterId, editorId, clientId, oauthToke
     console.log(`Download complete!`);
     console.log(`Successful: ${successful}/${clips.length}`);
     console.log(`Failed: ${failed}/${clips.length}`);
+    const failedClips = [...failedClipIds];
     if (failedClips.length > 0) {
         console.log(`Failed clip IDs:`, failedClips);
     }
@@ -80,6 +80,11 @@ function hideAuthExpiredBanner() {
     authExpiredBanner.style.display = 'none';
 }
 
+// Size estimate constants
+const BYTES_PER_SECOND = 698665.19; // Empirical average for Twitch clips
+const BYTES_PER_MB = 1024 * 1024;
+const SECONDS_PER_MINUTE = 60;
+
 // Function to calculate and display estimated download size
 function displaySizeEstimate(totalDurationSeconds, totalClips, filteredCount) {
     if (!totalDurationSeconds || totalDurationSeconds <= 0) {
@@ -87,16 +92,15 @@ function displaySizeEstimate(totalDurationSeconds, totalClips, filteredCount) {
         return;
     }
     
-    const BYTES_PER_SECOND = 698665.19;
     const totalBytes = totalDurationSeconds * BYTES_PER_SECOND;
-    const totalMB = totalBytes / (1024 * 1024);
+    const totalMB = totalBytes / BYTES_PER_MB;
     
     // Round to 1 decimal place
     const totalMBRounded = Math.round(totalMB * 10) / 10;
     
     // Convert duration to human-readable format
-    const minutes = Math.floor(totalDurationSeconds / 60);
-    const seconds = Math.round(totalDurationSeconds % 60);
+    const minutes = Math.floor(totalDurationSeconds / SECONDS_PER_MINUTE);
+    const seconds = Math.round(totalDurationSeconds % SECONDS_PER_MINUTE);
     const durationStr = minutes > 0 ? `${minutes}m ${seconds}s` : `${seconds}s`;
     
     // Build clip count message